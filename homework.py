@@ -1,9 +1,12 @@
 """Main module of Telegram bot."""
 
+import json
 import logging
 import os
+import signal
 import sys
-import time
+import threading
+from collections import deque
 from http import HTTPStatus
 from json import JSONDecodeError
 
@@ -11,6 +14,8 @@ import requests
 import telegram
 from dotenv import load_dotenv
 from requests import RequestException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import exceptions
 
@@ -23,10 +28,36 @@ TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
 RETRY_TIME = 600
+MIN_RETRY_TIME = 60
+ERROR_RETRY_TIME = 5
+RECENT_MESSAGES_LIMIT = 16
+API_TIMEOUT = (5, 30)
+
+STOP_EVENT = threading.Event()
+REQUEST_IN_PROGRESS = threading.Event()
+
+STATE_FILE = os.getenv(
+    "STATE_FILE", os.path.join(os.path.dirname(__file__), "bot_state.json")
+)
 
 ENDPOINT = "https://practicum.yandex.ru/api/user_api/homework_statuses/"
 HEADERS = {"Authorization": f"OAuth {PRACTICUM_TOKEN}"}
 
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=(500, 502, 503, 504),
+        ),
+    ),
+)
+
 HOMEWORK_VERDICTS = {
     "approved": "Работа проверена: ревьюеру всё понравилось. Ура!",
     "reviewing": "Работа взята на проверку ревьюером.",
@@ -34,23 +65,62 @@ HOMEWORK_VERDICTS = {
 }
 
 
+LOG_FORMATTER = logging.Formatter(
+    "%(asctime)s [%(levelname)s] %(message)s "
+    "[%(name)s] %(filename)s - %(lineno)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+
 def logging_settings() -> None:
     """Logging settings."""
+    if logger.handlers:
+        return
     logger.setLevel(logging.DEBUG)
     stream_handler = logging.StreamHandler(stream=sys.stdout)
-    formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(message)s "
-        "[%(name)s] %(filename)s - %(lineno)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    stream_handler.setFormatter(formatter)
+    stream_handler.setFormatter(LOG_FORMATTER)
     stream_handler.addFilter(logging.Filter(__name__))
     logger.addHandler(stream_handler)
 
 
+def load_state() -> dict:
+    """Loading bot state saved by previous run."""
+    try:
+        with open(STATE_FILE, encoding="utf-8") as file:
+            state = json.load(file)
+    except (OSError, JSONDecodeError) as error:
+        logger.debug("Bot state was not loaded: %s", error)
+        return {}
+    if not isinstance(state, dict):
+        logger.error("Bot state has unexpected data type: %s", state)
+        return {}
+    timestamp = state.get("current_timestamp", 0)
+    if type(timestamp) is not int or timestamp < 0:
+        logger.error("Bot state has invalid response time: %s", timestamp)
+        del state["current_timestamp"]
+    messages = state.get("recent_messages", [])
+    if not isinstance(messages, list) or not all(
+        isinstance(message, str) for message in messages
+    ):
+        logger.error("Bot state has invalid recent messages: %s", messages)
+        del state["recent_messages"]
+    return state
+
+
+def save_state(state: dict) -> None:
+    """Saving bot state for next run."""
+    temp_file = f"{STATE_FILE}.tmp"
+    try:
+        with open(temp_file, "w", encoding="utf-8") as file:
+            json.dump(state, file, ensure_ascii=False)
+        os.replace(temp_file, STATE_FILE)
+    except OSError as error:
+        logger.error("Bot state was not saved: %s", error)
+
+
 def send_message(bot: telegram.Bot, message: str) -> None:
     """Sending message to Telegram."""
-    logger.info(f"Bot sends a message: '{message}'")
+    logger.info("Bot sends a message: '%s'", message)
     try:
         bot.send_message(
             chat_id=TELEGRAM_CHAT_ID,
@@ -61,19 +131,37 @@ def send_message(bot: telegram.Bot, message: str) -> None:
             f"Error sending message from bot: {error}"
         )
     else:
-        logger.info(f"Bot sent a message: '{message}'")
+        logger.info("Bot sent a message: '%s'", message)
+
+
+def send_new_messages(
+    bot: telegram.Bot, messages: list, recent_messages: deque
+) -> None:
+    """Sending messages that were not sent recently to Telegram."""
+    for message in messages:
+        if message in recent_messages:
+            continue
+        try:
+            send_message(bot, message)
+        except exceptions.TelegramSendMessageError as error:
+            logger.error("Program crash: %s", error)
+        else:
+            recent_messages.append(message)
 
 
 def get_api_answer(current_timestamp: int) -> dict:
     """API service endpoint request."""
     logger.info("Endpoint request.")
     params = {"from_date": current_timestamp}
+    REQUEST_IN_PROGRESS.set()
     try:
-        homework_statuses = requests.get(
-            ENDPOINT, headers=HEADERS, params=params
+        homework_statuses = SESSION.get(
+            ENDPOINT, params=params, timeout=API_TIMEOUT
         )
     except RequestException as error:
         raise exceptions.RequestError(f"API request failed: {error}")
+    finally:
+        REQUEST_IN_PROGRESS.clear()
     if homework_statuses.status_code != HTTPStatus.OK:
         raise exceptions.HTTPStatusNotOK(
             f"Status code of API response is not OK: "
@@ -81,7 +169,7 @@ def get_api_answer(current_timestamp: int) -> dict:
         )
     try:
         return homework_statuses.json()
-    except JSONDecodeError:
+    except ValueError:
         raise exceptions.InvalidJSON(
             f"API response contains invalid JSON: {homework_statuses}"
         )
@@ -109,7 +197,7 @@ def check_response(response: dict) -> list:
     if not homeworks:
         raise exceptions.HomeworkNoNewInformation(
             f"API response does not contain new information "
-            f"about homeworks: {response}"
+            f"about homeworks. Response time: {response['current_date']}"
         )
     return homeworks
 
@@ -120,70 +208,116 @@ def parse_status(homework: dict) -> str:
     homework_status = homework.get("status")
     if not homework_status:
         raise KeyError(f"No homework status found in API response: {homework}")
+    homework_name = homework.get("homework_name")
+    if not homework_name:
+        raise KeyError(f"No homework title found in API response: {homework}")
     verdict = HOMEWORK_VERDICTS.get(homework_status)
     if not verdict:
         raise KeyError(
             f"Undocumented homework status was found in API response: "
             f"{homework}"
         )
-    homework_name = homework.get("homework_name")
-    if not homework_name:
-        raise KeyError(f"No homework title found in API response: {homework}")
     return f'Изменился статус проверки работы "{homework_name}". {verdict}'
 
 
+def parse_homeworks(homeworks: list) -> list:
+    """Get statuses of homeworks, oldest first."""
+    messages = []
+    for homework in reversed(homeworks):
+        try:
+            message = parse_status(homework)
+        except (KeyError, AttributeError, TypeError) as error:
+            message = f"Program crash: {error}"
+            logger.error(message)
+        else:
+            logger.info(message)
+        messages.append(message)
+    return messages
+
+
 def check_tokens() -> bool:
     """Checking availability of environment variables."""
     logger.info("Checking the availability of environment variables.")
     return all((PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID))
 
 
+def stop_on_signal(signum: int, frame) -> None:
+    """Stop bot between polls or abort pending API request."""
+    STOP_EVENT.set()
+    signal.signal(signum, signal.SIG_DFL)
+    if REQUEST_IN_PROGRESS.is_set():
+        raise KeyboardInterrupt
+
+
 def main() -> None:
     """Main logic of bot."""
     if not check_tokens():
+        tokens = {
+            "PRACTICUM_TOKEN": PRACTICUM_TOKEN,
+            "TELEGRAM_TOKEN": TELEGRAM_TOKEN,
+            "TELEGRAM_CHAT_ID": TELEGRAM_CHAT_ID,
+        }
         message = (
-            f"Missing required environment variable(s) during bot startup. "
-            f"PRACTICUM_TOKEN = {PRACTICUM_TOKEN}, "
-            f"TELEGRAM_TOKEN = {TELEGRAM_TOKEN}, "
-            f"TELEGRAM_CHAT_ID = {TELEGRAM_CHAT_ID}, "
+            f"Missing required environment variable(s) during bot startup: "
+            f"{', '.join(name for name, value in tokens.items() if not value)}"
         )
-        logger.critical(message, exc_info=True)
+        logger.critical(message)
         exit(message)
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    message = ""
-    previous_bot_message = ""
-    current_timestamp = 0
-    while True:
+    state = load_state()
+    recent_messages = deque(
+        state.get("recent_messages", []), maxlen=RECENT_MESSAGES_LIMIT
+    )
+    current_timestamp = state.get("current_timestamp", 0)
+    retry_time = RETRY_TIME
+    error_retry_time = ERROR_RETRY_TIME
+    while not STOP_EVENT.is_set():
         try:
             response = get_api_answer(current_timestamp)
             homeworks = check_response(response)
-            current_homework = homeworks[0]
-            message = parse_status(current_homework)
-            logger.info(message)
-            need_message = True
+            if not current_timestamp:
+                homeworks = homeworks[:1]
+            messages = parse_homeworks(homeworks)
+            retry_time = sleep_time = MIN_RETRY_TIME
+            error_retry_time = ERROR_RETRY_TIME
+            recent_messages.clear()
         except exceptions.DebugInfo as error:
             logger.debug(error)
-            need_message = False
+            messages = []
+            retry_time = sleep_time = min(RETRY_TIME, retry_time * 2)
+            error_retry_time = ERROR_RETRY_TIME
+        except (exceptions.RequestError, exceptions.HTTPStatusNotOK) as error:
+            message = f"Program crash: {error}"
+            logger.error(message)
+            messages = [message]
+            sleep_time = error_retry_time
+            error_retry_time = min(RETRY_TIME, error_retry_time * 2)
         except Exception as error:
             message = f"Program crash: {error}"
             logger.error(message, exc_info=True)
-            need_message = True
+            messages = [message]
+            sleep_time = retry_time
         else:
             current_timestamp = response["current_date"]
-        if previous_bot_message != message and need_message:
-            try:
-                send_message(bot, message)
-            except exceptions.TelegramSendMessageError as error:
-                logger.error(f"Program crash: {error}", exc_info=True)
-            else:
-                previous_bot_message = message
-        time.sleep(RETRY_TIME)
+        send_new_messages(bot, messages, recent_messages)
+        save_state(
+            {
+                "recent_messages": list(recent_messages),
+                "current_timestamp": current_timestamp,
+            }
+        )
+        STOP_EVENT.wait(sleep_time)
 
 
 if __name__ == "__main__":
     logging_settings()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, stop_on_signal)
     logger.info("The bot has started.")
     try:
         main()
     except KeyboardInterrupt:
-        logger.info("The bot has completed its work.")
+        logger.info("API request was interrupted.")
+    finally:
+        SESSION.close()
+    logger.info("The bot has completed its work.")
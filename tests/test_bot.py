@@ -1,7 +1,6 @@
 import os
 from http import HTTPStatus
 
-import requests
 import telegram
 import utils
 
@@ -54,6 +53,19 @@ class MockResponseGET:
         return data
 
 
+def session_get(mock_get):
+    """Emulate `requests.Session.get` merging session-level headers."""
+
+    def get(url, **kwargs):
+        import homework
+
+        headers = dict(homework.SESSION.headers)
+        headers.update(kwargs.pop("headers", {}))
+        return mock_get(url, headers=headers, **kwargs)
+
+    return get
+
+
 class MockTelegramBot:
     def __init__(self, token=None, random_timestamp=None, **kwargs):
         assert (
@@ -172,6 +184,18 @@ class TestHomework:
             homework, "logging"
         ), "Убедитесь, что настроили логирование для вашего бота"
 
+    def test_logging_settings_idempotent(self, monkeypatch):
+        import homework
+
+        monkeypatch.setattr(homework.logger, "handlers", [])
+        monkeypatch.setattr(homework.logger, "level", homework.logger.level)
+        homework.logging_settings()
+        homework.logging_settings()
+        assert len(homework.logger.handlers) == 1, (
+            "Убедитесь, что повторный вызов `logging_settings` "
+            "не добавляет обработчики логов"
+        )
+
     def test_send_message(self, monkeypatch, random_timestamp):
         def mock_telegram_bot(*args, **kwargs):
             return MockTelegramBot(
@@ -195,10 +219,12 @@ class TestHomework:
                 **kwargs,
             )
 
-        monkeypatch.setattr(requests, "get", mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_response_get)
+        )
+
         func_name = "get_api_answer"
         utils.check_function(homework, func_name, 1)
 
@@ -223,6 +249,38 @@ class TestHomework:
             "ключа `current_date`"
         )
 
+    def test_get_api_answer_session_settings(
+        self, monkeypatch, random_timestamp, current_timestamp
+    ):
+        request_kwargs = {}
+
+        def mock_response_get(*args, **kwargs):
+            request_kwargs.update(kwargs)
+            return MockResponseGET(
+                *args,
+                random_timestamp=random_timestamp,
+                current_timestamp=current_timestamp,
+                **kwargs,
+            )
+
+        import homework
+
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_response_get)
+        )
+
+        homework.get_api_answer(current_timestamp)
+        assert request_kwargs.get("timeout") == homework.API_TIMEOUT, (
+            "Проверьте, что запрос к API выполняется с таймаутом "
+            "`API_TIMEOUT`"
+        )
+        retries = homework.SESSION.get_adapter(homework.ENDPOINT).max_retries
+        assert retries.total == 3, (
+            "Проверьте, что для запросов к API настроены повторные попытки"
+        )
+        assert retries.backoff_factor == 1
+        assert set(retries.status_forcelist) == {500, 502, 503, 504}
+
     def test_get_500_api_answer(
         self, monkeypatch, random_timestamp, current_timestamp, api_url
     ):
@@ -242,10 +300,12 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, "get", mock_500_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_500_response_get)
+        )
+
         func_name = "get_api_answer"
         try:
             homework.get_api_answer(current_timestamp)
@@ -322,10 +382,12 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, "get", mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_response_get)
+        )
+
         func_name = "check_response"
         response = homework.get_api_answer(current_timestamp)
         status = homework.check_response(response)
@@ -358,10 +420,12 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, "get", mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_response_get)
+        )
+
         func_name = "parse_status"
         response = homework.get_api_answer(current_timestamp)
         homeworks = homework.check_response(response)
@@ -408,10 +472,12 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, "get", mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_response_get)
+        )
+
         func_name = "parse_status"
         response = homework.get_api_answer(current_timestamp)
         homeworks = homework.check_response(response)
@@ -454,10 +520,12 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, "get", mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_response_get)
+        )
+
         func_name = "parse_status"
         response = homework.get_api_answer(current_timestamp)
         homeworks = homework.check_response(response)
@@ -472,6 +540,33 @@ class TestHomework:
                 "при отсутствии ключа `homework_name` в ответе от API"
             )
 
+    def test_parse_status_empty_values(self):
+        import homework
+
+        func_name = "parse_status"
+        for test_data, error_text in (
+            ({"homework_name": "hw123", "status": None}, "No homework status"),
+            ({"homework_name": "hw123", "status": ""}, "No homework status"),
+            ({"homework_name": None, "status": "approved"}, "No homework title"),
+            ({"homework_name": "", "status": "approved"}, "No homework title"),
+            (
+                {"homework_name": "hw123", "status": "homework_name"},
+                "Undocumented homework status",
+            ),
+        ):
+            try:
+                homework.parse_status(test_data)
+            except KeyError as error:
+                assert error_text in str(error), (
+                    f"Убедитесь, что функция `{func_name}` сообщает "
+                    f"причину ошибки для {test_data}"
+                )
+            else:
+                assert False, (
+                    f"Убедитесь, что функция `{func_name}` выбрасывает "
+                    f"KeyError для {test_data}"
+                )
+
     def test_check_response_no_homeworks(
         self, monkeypatch, random_timestamp, current_timestamp, api_url
     ):
@@ -490,10 +585,12 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, "get", mock_no_homeworks_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_no_homeworks_response_get)
+        )
+
         func_name = "check_response"
         result = homework.get_api_answer(current_timestamp)
         try:
@@ -532,10 +629,12 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, "get", mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_response_get)
+        )
+
         func_name = "check_response"
         response = homework.get_api_answer(current_timestamp)
         try:
@@ -573,10 +672,12 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, "get", mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_response_get)
+        )
+
         func_name = "check_response"
         response = homework.get_api_answer(current_timestamp)
         try:
@@ -608,10 +709,12 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, "get", mock_empty_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_empty_response_get)
+        )
+
         func_name = "check_response"
         result = homework.get_api_answer(current_timestamp)
         try:
@@ -638,10 +741,12 @@ class TestHomework:
             )
             return response
 
-        monkeypatch.setattr(requests, "get", mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(
+            homework.SESSION, "get", session_get(mock_response_get)
+        )
+
         func_name = "check_response"
         try:
             homework.get_api_answer(current_timestamp)
@@ -0,0 +1,312 @@
+import json
+import signal
+import threading
+from http import HTTPStatus
+
+import pytest
+import requests
+import telegram
+
+import homework
+
+
+class MockResponse:
+    def __init__(self, data, status_code=HTTPStatus.OK):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        if isinstance(self.data, Exception):
+            raise self.data
+        return self.data
+
+
+class MockSession:
+    def __init__(self, results):
+        self.results = list(results)
+        self.from_dates = []
+
+    def get(self, url, params=None, **kwargs):
+        self.from_dates.append(params["from_date"])
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class MockStopEvent:
+    def __init__(self, session):
+        self.session = session
+        self.waits = []
+
+    def is_set(self):
+        return not self.session.results
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+
+
+class MockBot:
+    def __init__(self, token=None, **kwargs):
+        self.messages = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.messages.append(text)
+
+
+def api_response(homeworks, current_date):
+    return MockResponse(
+        {"homeworks": homeworks, "current_date": current_date}
+    )
+
+
+def status_message(name, status):
+    return (
+        f'Изменился статус проверки работы "{name}". '
+        f"{homework.HOMEWORK_VERDICTS[status]}"
+    )
+
+
+class TestMainLoop:
+    @pytest.fixture
+    def run_main(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(homework, "PRACTICUM_TOKEN", "sometoken")
+        monkeypatch.setattr(homework, "TELEGRAM_TOKEN", "1234:abcdefg")
+        monkeypatch.setattr(homework, "TELEGRAM_CHAT_ID", 12345)
+        monkeypatch.setattr(
+            homework, "STATE_FILE", str(tmp_path / "bot_state.json")
+        )
+        bot = MockBot()
+        monkeypatch.setattr(telegram, "Bot", lambda *args, **kwargs: bot)
+
+        def run(results, state=None):
+            if state is not None:
+                homework.save_state(state)
+            session = MockSession(results)
+            stop_event = MockStopEvent(session)
+            monkeypatch.setattr(homework.SESSION, "get", session.get)
+            monkeypatch.setattr(homework, "STOP_EVENT", stop_event)
+            homework.main()
+            return bot.messages, stop_event.waits, session.from_dates
+
+        return run
+
+    def test_cold_start_reports_only_newest_homework(self, run_main):
+        messages, _, _ = run_main(
+            [
+                api_response(
+                    [
+                        {"homework_name": "hw3", "status": "approved"},
+                        {"homework_name": "hw2", "status": "rejected"},
+                        {"homework_name": "hw1", "status": "approved"},
+                    ],
+                    100,
+                )
+            ]
+        )
+        assert messages == [status_message("hw3", "approved")]
+
+    def test_all_updated_homeworks_are_sent_oldest_first(self, run_main):
+        messages, _, from_dates = run_main(
+            [
+                api_response(
+                    [
+                        {"homework_name": "hw2", "status": "reviewing"},
+                        {"homework_name": "hw1", "status": "approved"},
+                    ],
+                    200,
+                ),
+                api_response([], 300),
+            ],
+            state={"current_timestamp": 100},
+        )
+        assert messages == [
+            status_message("hw1", "approved"),
+            status_message("hw2", "reviewing"),
+        ]
+        assert from_dates == [100, 200]
+
+    def test_invalid_homework_does_not_block_others(self, run_main):
+        messages, _, from_dates = run_main(
+            [
+                api_response(
+                    [
+                        {"homework_name": "hw2", "status": "unknown"},
+                        {"homework_name": "hw1", "status": "approved"},
+                    ],
+                    200,
+                ),
+                api_response([], 300),
+            ],
+            state={"current_timestamp": 100},
+        )
+        assert len(messages) == 2
+        assert messages[0] == status_message("hw1", "approved")
+        assert "Undocumented homework status" in messages[1]
+        assert from_dates == [100, 200]
+
+    def test_poll_interval_adapts_to_activity(self, run_main):
+        _, waits, _ = run_main(
+            [
+                api_response(
+                    [{"homework_name": "hw1", "status": "approved"}], 200
+                ),
+                api_response([], 300),
+                api_response([], 300),
+                api_response([], 300),
+                api_response([], 300),
+            ],
+            state={"current_timestamp": 100},
+        )
+        assert waits == [60, 120, 240, 480, 600]
+
+    def test_request_errors_back_off_from_short_interval(self, run_main):
+        error = requests.ConnectionError("connection refused")
+        _, waits, _ = run_main(
+            [
+                error,
+                error,
+                error,
+                api_response([], 300),
+                error,
+            ],
+            state={"current_timestamp": 100},
+        )
+        assert waits == [5, 10, 20, 600, 5]
+
+    def test_unexpected_error_waits_normal_interval(self, run_main):
+        _, waits, _ = run_main(
+            [MockResponse(ValueError("invalid JSON"))] * 2,
+            state={"current_timestamp": 100},
+        )
+        assert waits == [600, 600]
+
+    def test_recent_errors_are_not_resent(self, run_main):
+        first_error = requests.ConnectionError("connection refused")
+        second_error = MockResponse({}, HTTPStatus.INTERNAL_SERVER_ERROR)
+        messages, _, _ = run_main(
+            [
+                first_error,
+                second_error,
+                first_error,
+                second_error,
+                api_response(
+                    [{"homework_name": "hw1", "status": "approved"}], 200
+                ),
+                first_error,
+            ],
+            state={"current_timestamp": 100},
+        )
+        assert len(messages) == 4
+        assert "connection refused" in messages[0]
+        assert "500" in messages[1]
+        assert messages[2] == status_message("hw1", "approved")
+        assert messages[3] == messages[0]
+
+    def test_state_is_saved_between_runs(self, run_main):
+        run_main(
+            [
+                api_response(
+                    [{"homework_name": "hw1", "status": "approved"}], 200
+                )
+            ],
+            state={"current_timestamp": 100},
+        )
+        state = homework.load_state()
+        assert state == {
+            "recent_messages": [status_message("hw1", "approved")],
+            "current_timestamp": 200,
+        }
+
+    @pytest.mark.parametrize(
+        "state",
+        [
+            {"current_timestamp": "x"},
+            {"current_timestamp": -1},
+            {"current_timestamp": True},
+            {"recent_messages": 5},
+            {"recent_messages": [1, 2]},
+        ],
+    )
+    def test_invalid_state_fields_fall_back_to_defaults(self, run_main, state):
+        messages, _, from_dates = run_main(
+            [
+                api_response(
+                    [
+                        {"homework_name": "hw2", "status": "approved"},
+                        {"homework_name": "hw1", "status": "approved"},
+                    ],
+                    200,
+                ),
+                api_response([], 300),
+            ],
+            state=state,
+        )
+        assert from_dates == [0, 200]
+        assert messages == [status_message("hw2", "approved")]
+
+    def test_state_of_unexpected_type_is_ignored(self, monkeypatch, tmp_path):
+        state_file = tmp_path / "bot_state.json"
+        state_file.write_text(json.dumps([]), encoding="utf-8")
+        monkeypatch.setattr(homework, "STATE_FILE", str(state_file))
+        assert homework.load_state() == {}
+
+
+class TestStopSignal:
+    @pytest.fixture
+    def bot(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(homework, "PRACTICUM_TOKEN", "sometoken")
+        monkeypatch.setattr(homework, "TELEGRAM_TOKEN", "1234:abcdefg")
+        monkeypatch.setattr(homework, "TELEGRAM_CHAT_ID", 12345)
+        monkeypatch.setattr(
+            homework, "STATE_FILE", str(tmp_path / "bot_state.json")
+        )
+        monkeypatch.setattr(homework, "STOP_EVENT", threading.Event())
+        self.handlers = []
+        monkeypatch.setattr(
+            signal,
+            "signal",
+            lambda signum, handler: self.handlers.append((signum, handler)),
+        )
+        homework.save_state({"current_timestamp": 100})
+        bot = MockBot()
+        monkeypatch.setattr(telegram, "Bot", lambda *args, **kwargs: bot)
+        return bot
+
+    def test_signal_between_polls_stops_after_poll(self, monkeypatch, bot):
+        def send_message(chat_id=None, text=None, **kwargs):
+            homework.stop_on_signal(signal.SIGTERM, None)
+            bot.messages.append(text)
+
+        monkeypatch.setattr(bot, "send_message", send_message)
+        session = MockSession(
+            [
+                api_response(
+                    [{"homework_name": "hw1", "status": "approved"}], 200
+                ),
+                api_response([], 300),
+            ]
+        )
+        monkeypatch.setattr(homework.SESSION, "get", session.get)
+
+        homework.main()
+
+        assert bot.messages == [status_message("hw1", "approved")]
+        assert session.from_dates == [100]
+        assert homework.load_state()["current_timestamp"] == 200
+        assert self.handlers == [(signal.SIGTERM, signal.SIG_DFL)]
+
+    def test_signal_during_request_aborts_it(self, monkeypatch, bot):
+        def hung_get(url, params=None, **kwargs):
+            homework.stop_on_signal(signal.SIGTERM, None)
+            raise AssertionError("request was not interrupted")
+
+        monkeypatch.setattr(homework.SESSION, "get", hung_get)
+
+        with pytest.raises(KeyboardInterrupt):
+            homework.main()
+
+        assert bot.messages == []
+        assert homework.load_state() == {"current_timestamp": 100}
+        assert not homework.REQUEST_IN_PROGRESS.is_set()
+        assert self.handlers == [(signal.SIGTERM, signal.SIG_DFL)]